@@ -576,6 +576,16 @@ async def main():
 
     print("=" * 50)
 
+    # Create the sandbox in the background while the task is read or the
+    # agent starts; fall back to a blocking warm-up if that is not possible
+    if agent.lybic_client:
+        try:
+            if not agent.lybic_client.start_warm_up():
+                agent.lybic_client.warm_up_sync()
+        except Exception as e:
+            # Warm-up is only an optimization; the first step retries setup
+            print(f"Warning: Lybic warm-up failed, continuing: {e!r}")
+
     # Run with provided task or enter interactive mode
     if args.task:
         print(f"\nTask: {args.task}\n")
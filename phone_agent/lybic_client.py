@@ -1,11 +1,17 @@
 """Lybic cloud sandbox client for Phone Agent."""
 
 import asyncio
-import base64
+import concurrent.futures
+import importlib.util
+import re
 import threading
-from dataclasses import dataclass
-from typing import Any, Optional
+import uuid
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from io import BytesIO
+from typing import Any, Callable, Optional
 
+import httpx
 from lybic import LybicClient
 from lybic.authentication import LybicAuth
 from lybic.dto import (
@@ -25,17 +31,113 @@ from lybic.action import (
     FinishedAction,
     PixelLength,
 )
+from PIL import Image
+
+try:
+    # SIMD base64 codec; same API as the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 from phone_agent.config.apps import APP_PACKAGES
 
+# Package (as bytes, to scan dumpsys output without decoding) -> app name.
+# Several app names share a package; iterate in reverse so the first listed
+# name wins, as with the previous linear scan
+_PKG_TO_APP: dict[bytes, str] = {
+    package.encode(): app_name
+    for app_name, package in reversed(APP_PACKAGES.items())
+}
+
+# Every dotted token on a focus line is a package candidate, looked up directly
+# in _PKG_TO_APP: "com.tencent.mm/.ui.LauncherUI" as well as bare window names
+# such as "Window{... u0 Splash Screen com.tencent.mm}"
+_PKG_TOKEN_RE = re.compile(rb"[A-Za-z0-9_.]+")
+_FOCUS_LINE_RE = re.compile(rb"^.*(?:mCurrentFocus|mFocusedApp).*$", re.MULTILINE)
+# Filter on the device: the focus lines come after the full window list, so
+# only grep (not a byte-count head) both bounds the output and keeps them
+_FOCUS_COMMAND = "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"
+_FOCUS_PROCESS_DTO = SandboxProcessRequestDto(
+    executable="sh", args=["-c", _FOCUS_COMMAND]
+)
+_DURATION_RE = re.compile(r"\d*\.?\d+")
+
+# Screenshot downloads: HTTP/2 needs the optional h2 package (pip install
+# "httpx[http2]", see requirements.txt); without it the pool stays on HTTP/1.1
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=8, max_keepalive_connections=8, keepalive_expiry=60
+)
+
+# Prebuilt action requests; model_copy() swaps in the action and a fresh
+# callId without re-running pydantic validation on every call
+_ACTION_DTO = ExecuteSandboxActionDto(action={}, includeScreenShot=False)
+_ACTION_WITH_SCREENSHOT_DTO = ExecuteSandboxActionDto(action={}, includeScreenShot=True)
+
+
+def _action_dto(
+    template: ExecuteSandboxActionDto, action: Any
+) -> ExecuteSandboxActionDto:
+    """Build an action request from a prebuilt template."""
+    return template.model_copy(update={"action": action, "callId": str(uuid.uuid4())})
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using the eager task factory when available."""
+    loop = asyncio.new_event_loop()
+    # Let coroutines that finish without suspending (e.g. cached
+    # client/sandbox lookups) complete inline (Python 3.12+)
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+    return loop
+
+
+def _in_running_loop() -> bool:
+    """Check whether an event loop is running in the current thread."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def _with_timeout(coro, timeout: float):
+    """Await a coroutine, cancelling it after `timeout` seconds."""
+    async with asyncio.timeout(timeout):
+        return await coro
+
+
+def _report_warm_up_failure(future: concurrent.futures.Future) -> None:
+    """Print a warning if a background warm-up failed."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Warning: Lybic warm-up failed, continuing: {future.exception()!r}")
+
+
+def _pooled_transport() -> httpx.AsyncHTTPTransport:
+    """Create a keep-alive transport, multiplexed over HTTP/2 when possible."""
+    return httpx.AsyncHTTPTransport(http2=_HTTP2, retries=1, limits=_HTTP_LIMITS)
+
 
 @dataclass
 class Screenshot:
     """Represents a captured screenshot."""
 
-    base64_data: str
     width: int
     height: int
     is_sensitive: bool = False
+    # Encoded image bytes as served by the sandbox (base64-decoded data)
+    raw_bytes: bytes = field(default=b"", repr=False)
+
+    @cached_property
+    def base64_data(self) -> str:
+        """Base64 of raw_bytes, encoded once on first access."""
+        return base64.b64encode(self.raw_bytes).decode("ascii")
+
+    @cached_property
+    def pil_image(self) -> Any:
+        """PIL image opened on first access; pixels load only when read."""
+        return Image.open(BytesIO(self.raw_bytes))
 
 
 @dataclass
@@ -48,6 +150,15 @@ class LybicConfig:
     sandbox_id: Optional[str] = None
     sandbox_shape: str = "guangzhou-4c6g-android-12"
     sandbox_max_life_seconds: int = 3600
+    # Passed to LybicClient (SDK defaults). Every per-operation timeout is
+    # derived from these, so a slow but successful call (retries included)
+    # is never cancelled locally
+    request_timeout: int = 10
+    max_retries: int = 3
+    # Run a background event loop thread instead of an asyncio.Runner on the
+    # caller's thread; needed if sync methods are called from several threads.
+    # Chosen automatically when first called inside a running event loop
+    use_thread_loop: bool = False
 
 
 class LybicPhoneClient:
@@ -57,21 +168,49 @@ class LybicPhoneClient:
     Replaces local ADB connection with cloud-based Android sandbox.
     """
 
+    __slots__ = (
+        "config",
+        "sandbox_id",
+        "_client",
+        "_http",
+        "_screen_width",
+        "_screen_height",
+        "_size_known",
+        "_use_thread_loop",
+        "_runner",
+        "_loop",
+        "_loop_thread",
+        "_initialized",
+        "_ready",
+        "_pending_actions",
+        "_init_lock",
+    )
+
     def __init__(self, config: LybicConfig):
         self.config = config
         self.sandbox_id: Optional[str] = config.sandbox_id
         self._client: Optional[LybicClient] = None
+        # Separate pool for screenshot downloads, which must not carry API auth
+        self._http: Optional[httpx.AsyncClient] = None
         self._screen_width: int = 1080
         self._screen_height: int = 2400
+        self._size_known = False
+        # asyncio.Runner needs Python 3.11+; older versions use the loop thread
+        self._use_thread_loop = config.use_thread_loop or not hasattr(asyncio, "Runner")
+        self._runner: Optional["asyncio.Runner"] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._loop_thread: Optional[threading.Thread] = None
         self._initialized = False
+        self._ready = False
+        self._pending_actions: list[Any] = []
+        # Serializes sandbox creation; _ensure_client never suspends
+        self._init_lock: Optional[asyncio.Lock] = None
 
     def _ensure_loop(self):
         """Ensure we have a dedicated event loop in a separate thread."""
         if self._loop is None or not self._loop.is_running():
-            self._loop = asyncio.new_event_loop()
-            
+            self._loop = _new_event_loop()
+
             def run_loop():
                 asyncio.set_event_loop(self._loop)
                 self._loop.run_forever()
@@ -79,11 +218,44 @@ class LybicPhoneClient:
             self._loop_thread = threading.Thread(target=run_loop, daemon=True)
             self._loop_thread.start()
 
-    def _run_async(self, coro):
-        """Run an async coroutine in the dedicated loop."""
+    def _run_async(self, coro, timeout: float = 10.0):
+        """
+        Run an async coroutine on the client's event loop.
+
+        By default the coroutine runs on the caller's thread through an
+        asyncio.Runner that is kept open between calls. Raises TimeoutError
+        after `timeout` seconds, in which case the coroutine is cancelled.
+        """
+        # Hot path: a single attribute load once the runner exists
+        runner = self._runner
+        if runner is None and not self._use_thread_loop:
+            runner = self._init_runner()
+        if runner is not None:
+            return runner.run(_with_timeout(coro, timeout))
+
         self._ensure_loop()
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return future.result(timeout=30)  # 30 second timeout
+        loop = self._loop
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _init_runner(self) -> Optional["asyncio.Runner"]:
+        """Create the Runner on first use, or switch to the loop thread."""
+        # Runner.run() cannot be nested in a running loop (e.g. main.py
+        # drives the agent from inside asyncio.run); use the loop thread
+        self._use_thread_loop = _in_running_loop()
+        if not self._use_thread_loop:
+            self._runner = asyncio.Runner(loop_factory=_new_event_loop)
+        return self._runner
+
+    def _ensure_ready_sync(self) -> None:
+        """Run cold-path initialization under its own, longer timeout."""
+        if not self._ready:
+            # At most one request: sandbox creation
+            self._run_async(self._ensure_ready(), self._request_budget())
 
     async def _ensure_client(self) -> LybicClient:
         """Ensure client is initialized."""
@@ -93,9 +265,16 @@ class LybicPhoneClient:
                 api_key=self.config.api_key,
                 endpoint=self.config.endpoint,
             ) if self.config.org_id or self.config.api_key or self.config.endpoint else None
-            self._client = LybicClient(auth=auth)
+            self._client = LybicClient(
+                auth=auth,
+                timeout=self.config.request_timeout,
+                max_retries=self.config.max_retries,
+            )
             # Enter the context manager once
             await self._client.__aenter__()
+            self._http = httpx.AsyncClient(
+                timeout=self._client.timeout, transport=_pooled_transport()
+            )
             self._initialized = True
         return self._client
 
@@ -105,61 +284,266 @@ class LybicPhoneClient:
             return self.sandbox_id
 
         client = await self._ensure_client()
-        sandbox = await client.sandbox.create(
-            CreateSandboxDto(
-                name="phone-agent-sandbox",
-                shape=self.config.sandbox_shape,
-                maxLifeSeconds=self.config.sandbox_max_life_seconds,
+        # Created lazily so the lock belongs to the loop that runs it
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            # Another caller may have created the sandbox while we waited
+            if self.sandbox_id:
+                return self.sandbox_id
+
+            sandbox = await client.sandbox.create(
+                CreateSandboxDto(
+                    name="phone-agent-sandbox",
+                    shape=self.config.sandbox_shape,
+                    maxLifeSeconds=self.config.sandbox_max_life_seconds,
+                )
             )
-        )
-        self.sandbox_id = sandbox.id
-        print(f"Created sandbox: {self.sandbox_id}")
-        return self.sandbox_id
+            self.sandbox_id = sandbox.id
+            # A new sandbox may have a different screen size
+            self._size_known = False
+            print(f"Created sandbox: {self.sandbox_id}")
+            return self.sandbox_id
+
+    async def _ensure_ready(self) -> None:
+        """Initialize client and sandbox on the cold path."""
+        await self._ensure_sandbox()
+        await self._ensure_client()
+        self._ready = True
+
+    def warm_up_sync(self) -> None:
+        """Initialize the client and sandbox ahead of time (synchronous wrapper)."""
+        if not self._ready:
+            self._run_async(self.warm_up(), self._request_budget())
+
+    def start_warm_up(self) -> bool:
+        """
+        Start warm_up() on the loop thread without waiting for it.
+
+        Lets sandbox creation overlap with whatever the caller does next;
+        the first real call waits on the creation lock if it is still in
+        flight. Failures are reported as a warning and retried by that
+        call. Returns False without doing anything when calls run on the
+        caller's thread through asyncio.Runner.
+        """
+        if self._ready:
+            return True
+        if self._runner is None and not self._use_thread_loop:
+            self._init_runner()
+        if not self._use_thread_loop:
+            return False
+
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.warm_up(), self._loop)
+        future.add_done_callback(_report_warm_up_failure)
+        return True
+
+    async def warm_up(self) -> None:
+        """
+        Initialize the client and sandbox ahead of the first call.
+
+        Call once at agent start-up to take sandbox creation off the first
+        step. When an existing sandbox is configured nothing has been sent
+        yet, so a cheap sandbox lookup opens the API connection instead.
+        Does nothing if the client is already ready.
+        """
+        if self._ready:
+            return
+        preset = self.sandbox_id is not None
+        await self._ensure_ready()
+        if preset:
+            await self._client.sandbox.get(self.sandbox_id)
+
+    def get_screenshot_sync(self, need_image: bool = False) -> Screenshot:
+        """
+        Get screenshot from sandbox (synchronous wrapper).
 
-    def get_screenshot_sync(self) -> Screenshot:
-        """Get screenshot from sandbox (synchronous wrapper)."""
-        return self._run_async(self._get_screenshot_async())
+        Args:
+            need_image: Also decode the pixels into Screenshot.pil_image.
+                Leave False when only base64_data is needed (e.g. for the
+                model); the image is then never decoded.
+        """
+        if self._pending_actions:
+            self.flush()
+        if not self._ready:
+            self._ensure_ready_sync()
+        return self._run_async(
+            self._get_screenshot_async(need_image), self._screenshot_timeout()
+        )
 
-    async def _get_screenshot_async(self) -> Screenshot:
+    async def _get_screenshot_async(self, need_image: bool = False) -> Screenshot:
         """Get screenshot from sandbox."""
-        sandbox_id = await self._ensure_sandbox()
-        client = await self._ensure_client()
+        if not self._ready:
+            await self._ensure_ready()
+        sandbox_id = self.sandbox_id
+        client = self._client
+
+        # Fetch the preview URL ourselves instead of sandbox.get_screenshot(),
+        # which fully decodes the image and re-encodes it before base64
+        preview = await client.sandbox.preview(sandbox_id)
+        screenshot = await self._download_screenshot(preview.screenShot)
+        if need_image:
+            screenshot.pil_image.load()
+        return screenshot
 
-        screenshot_url, img, base64_str = await client.sandbox.get_screenshot(sandbox_id)
+    def execute_action_sync(self, action: Any) -> None:
+        """Execute an action on the sandbox (synchronous wrapper)."""
+        self.execute_actions_sync([action])
 
-        if img:
-            self._screen_width, self._screen_height = img.size
+    def execute_actions_sync(self, actions: list[Any]) -> None:
+        """Execute several actions in order with a single hop to the loop."""
+        self._pending_actions.extend(actions)
+        self.flush()
+
+    def queue_action(self, action: Any) -> None:
+        """
+        Queue an action without sending it.
 
-        return Screenshot(
-            base64_data=base64_str,
+        Queued actions are sent on the next flush(), which also happens
+        before any screenshot, current-app query or immediate action.
+        """
+        self._pending_actions.append(action)
+
+    def flush(self) -> None:
+        """Send all queued actions to the sandbox."""
+        if not self._pending_actions:
+            return
+        actions = _coalesce_actions(self._pending_actions)
+        self._pending_actions = []
+        self._ensure_ready_sync()
+        self._run_async(
+            self._execute_actions_async(actions), self._action_timeout(actions)
+        )
+
+    def execute_action_and_screenshot_sync(self, action: Any) -> Optional[Screenshot]:
+        """
+        Execute an action and capture the resulting screen (synchronous wrapper).
+
+        Asks the sandbox to include a screenshot in the action response,
+        saving the separate preview request of get_screenshot_sync().
+        Returns None if the action succeeded but no screenshot could be fetched.
+
+        The frame is captured as soon as the action returns, with no settle
+        delay, so screen transitions (app launch, navigation) may still be in
+        progress. PhoneAgent therefore keeps taking its own screenshot after
+        the inter-step delay; this is an opt-in API.
+        """
+        if self._pending_actions:
+            self.flush()
+        if not self._ready:
+            self._ensure_ready_sync()
+        return self._run_async(
+            self._execute_action_and_screenshot_async(action),
+            self._action_timeout([action]) + self._download_budget(),
+        )
+
+    async def _execute_action_and_screenshot_async(
+        self, action: Any
+    ) -> Optional[Screenshot]:
+        """Execute an action and capture the resulting screen."""
+        if not self._ready:
+            await self._ensure_ready()
+        sandbox_id = self.sandbox_id
+        client = self._client
+
+        action_dto = _action_dto(_ACTION_WITH_SCREENSHOT_DTO, action)
+        response = await client.sandbox.execute_sandbox_action(sandbox_id, action_dto)
+
+        if not response.screenShot:
+            return None
+        try:
+            return await self._download_screenshot(response.screenShot)
+        except Exception as e:
+            print(f"Warning: Failed to download action screenshot from lybic: {e}")
+            return None
+
+    async def _download_screenshot(self, url: str) -> Screenshot:
+        """Download a screenshot URL returned by the sandbox."""
+        response = await self._http.get(url)
+        response.raise_for_status()
+        content = response.content
+
+        screenshot = Screenshot(
             width=self._screen_width,
             height=self._screen_height,
             is_sensitive=False,
+            raw_bytes=content,
         )
+        # The sandbox shape is fixed, so only the first frame is probed; this
+        # parses just the image header
+        if not self._size_known:
+            self._screen_width, self._screen_height = screenshot.pil_image.size
+            screenshot.width = self._screen_width
+            screenshot.height = self._screen_height
+            self._size_known = True
+        return screenshot
+
+    def _request_budget(self) -> float:
+        """Worst-case time of one LybicClient request, retries and backoff included."""
+        attempts = self.config.max_retries + 1
+        # The SDK sleeps 2 ** attempt seconds after each failed attempt
+        backoff = sum(2**attempt for attempt in range(attempts))
+        return self.config.request_timeout * attempts + backoff
+
+    def _download_budget(self) -> float:
+        """Worst-case time of one screenshot download (one connect retry)."""
+        return self.config.request_timeout * 2
+
+    def _screenshot_timeout(self) -> float:
+        """Timeout for a preview request plus the screenshot download."""
+        return self._request_budget() + self._download_budget()
+
+    def _action_timeout(self, actions: list[Any]) -> float:
+        """Timeout for a batch of actions, leaving room for timed actions."""
+        duration_ms = sum(
+            a.duration
+            for a in actions
+            if isinstance(a, (WaitAction, TouchLongPressAction))
+        )
+        return len(actions) * self._request_budget() + duration_ms / 1000
 
-    def execute_action_sync(self, action: Any) -> None:
-        """Execute an action on the sandbox (synchronous wrapper)."""
-        return self._run_async(self._execute_action_async(action))
+    async def _execute_actions_async(self, actions: list[Any]) -> None:
+        """Execute actions on the sandbox, strictly in order."""
+        for action in actions:
+            await self._execute_action_async(action)
 
     async def _execute_action_async(self, action: Any) -> None:
         """Execute an action on the sandbox."""
-        sandbox_id = await self._ensure_sandbox()
-        client = await self._ensure_client()
+        if not self._ready:
+            await self._ensure_ready()
+        sandbox_id = self.sandbox_id
+        client = self._client
 
-        action_dto = ExecuteSandboxActionDto(
-            action=action,
-            includeScreenShot=False,
-        )
+        action_dto = _action_dto(_ACTION_DTO, action)
         await client.sandbox.execute_sandbox_action(sandbox_id, action_dto)
 
     async def close(self) -> None:
         """Close the client."""
+        await self._close_clients()
+
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loop_thread:
+                self._loop_thread.join(timeout=2)
+
+    async def _close_clients(self) -> None:
+        """Close the HTTP clients."""
         if self._client and self._initialized:
             await self._client.__aexit__(None, None, None)
+            await self._http.aclose()
             self._client = None
+            self._http = None
             self._initialized = False
-        
-        if self._loop and self._loop.is_running():
+            self._ready = False
+
+    def close_sync(self) -> None:
+        """Close the client and release its event loop (synchronous wrapper)."""
+        if self._runner is not None:
+            self._runner.run(self._close_clients())
+            self._runner.close()
+            self._runner = None
+        elif self._loop and self._loop.is_running():
+            self._run_async(self._close_clients())
             self._loop.call_soon_threadsafe(self._loop.stop)
             if self._loop_thread:
                 self._loop_thread.join(timeout=2)
@@ -168,33 +552,42 @@ class LybicPhoneClient:
         """
         Get current app name from lybic sandbox (synchronous wrapper).
         
-        Uses execute_process to run 'dumpsys window' and parse the output.
+        Uses execute_process to run 'dumpsys window', filtered to the focus
+        lines on the device, and parse the output.
         """
-        return self._run_async(self._get_current_app_async())
+        if self._pending_actions:
+            self.flush()
+        try:
+            self._ensure_ready_sync()
+            return self._run_async(
+                self._get_current_app_async(), self._request_budget()
+            )
+        except Exception as e:
+            print(f"Warning: Failed to get current app from lybic: {e!r}")
+            return "System Home"
 
     async def _get_current_app_async(self) -> str:
         """Get current app name from lybic sandbox (async implementation)."""
         try:
-            sandbox_id = await self._ensure_sandbox()
-            client = await self._ensure_client()
+            if not self._ready:
+                await self._ensure_ready()
+            sandbox_id = self.sandbox_id
+            client = self._client
 
             result = await client.sandbox.execute_process(
                 sandbox_id,
-                SandboxProcessRequestDto(
-                    executable="dumpsys",
-                    args=['window']
-                )
+                _FOCUS_PROCESS_DTO,
             )
             
-            # Decode base64 stdout
-            output = base64.b64decode(result.stdoutBase64).decode('utf-8', errors='ignore')
-            
+            # Decode base64 stdout, keeping it as bytes (no UTF-8 decode pass)
+            output = base64.b64decode(result.stdoutBase64, validate=False)
+
             # Parse window focus info (same logic as ADB version)
-            for line in output.split("\n"):
-                if "mCurrentFocus" in line or "mFocusedApp" in line:
-                    for app_name, package in APP_PACKAGES.items():
-                        if package in line:
-                            return app_name
+            for line in _FOCUS_LINE_RE.finditer(output):
+                for package in _PKG_TOKEN_RE.findall(line.group(0)):
+                    app_name = _PKG_TO_APP.get(package)
+                    if app_name:
+                        return app_name
             
             return "System Home"
             
@@ -213,101 +606,145 @@ class LybicPhoneClient:
         return self._screen_height
 
 
-def convert_action_to_lybic(action: dict[str, Any], screen_width: int, screen_height: int) -> Any:
+def _coalesce_actions(actions: list[Any]) -> list[Any]:
     """
-    Convert phone_agent action dict to lybic action object.
+    Merge adjacent wait actions into one to save sandbox round-trips.
 
-    Args:
-        action: Action dictionary from the AI model.
-        screen_width: Screen width in pixels.
-        screen_height: Screen height in pixels.
-
-    Returns:
-        Lybic action object.
+    Other actions change the screen state and are kept as-is, in order.
     """
-    action_type = action.get("_metadata")
+    coalesced: list[Any] = []
+    for action in actions:
+        if (
+            isinstance(action, WaitAction)
+            and coalesced
+            and isinstance(coalesced[-1], WaitAction)
+        ):
+            coalesced[-1] = WaitAction(
+                duration=coalesced[-1].duration + action.duration
+            )
+        else:
+            coalesced.append(action)
+    return coalesced
+
+
+def _convert_relative_to_absolute(
+    element: list[int], screen_width: int, screen_height: int
+) -> tuple[int, int]:
+    """Convert relative coordinates (0-1000) to absolute pixels."""
+    # Integer math; int() only matters if the model emits float coordinates
+    return (
+        int(element[0]) * screen_width // 1000,
+        int(element[1]) * screen_height // 1000,
+    )
+
+
+def _handle_tap(action: dict[str, Any], screen_width: int, screen_height: int) -> Any:
+    """Convert tap and double tap actions."""
+    element = action.get("element", [500, 500])
+    x, y = _convert_relative_to_absolute(element, screen_width, screen_height)
+    return TouchTapAction(
+        x=PixelLength(value=x),
+        y=PixelLength(value=y),
+    )
+
+
+def _handle_long_press(
+    action: dict[str, Any], screen_width: int, screen_height: int
+) -> Any:
+    """Convert long press action."""
+    element = action.get("element", [500, 500])
+    x, y = _convert_relative_to_absolute(element, screen_width, screen_height)
+    return TouchLongPressAction(
+        x=PixelLength(value=x),
+        y=PixelLength(value=y),
+        duration=3000,
+    )
+
+
+def _handle_swipe(action: dict[str, Any], screen_width: int, screen_height: int) -> Any:
+    """Convert swipe action."""
+    start = action.get("start", [500, 500])
+    end = action.get("end", [500, 500])
+    start_x, start_y = _convert_relative_to_absolute(start, screen_width, screen_height)
+    end_x, end_y = _convert_relative_to_absolute(end, screen_width, screen_height)
+
+    dx = end_x - start_x
+    dy = end_y - start_y
+
+    if abs(dx) > abs(dy):
+        direction = "right" if dx > 0 else "left"
+        distance = abs(dx)
+    else:
+        direction = "down" if dy > 0 else "up"
+        distance = abs(dy)
 
-    if action_type == "finish":
-        return FinishedAction(message=action.get("message"))
+    return TouchSwipeAction(
+        x=PixelLength(value=start_x),
+        y=PixelLength(value=start_y),
+        direction=direction,
+        distance=PixelLength(value=distance),
+    )
 
-    action_name = action.get("action")
 
-    def convert_relative_to_absolute(element: list[int]) -> tuple[int, int]:
-        """Convert relative coordinates (0-1000) to absolute pixels."""
-        x = int(element[0] / 1000 * screen_width)
-        y = int(element[1] / 1000 * screen_height)
-        return x, y
+def _handle_type(action: dict[str, Any], screen_width: int, screen_height: int) -> Any:
+    """Convert text input action."""
+    text = action.get("text", "")
+    return KeyboardTypeAction(content=text)
 
-    if action_name == "Tap":
-        element = action.get("element", [500, 500])
-        x, y = convert_relative_to_absolute(element)
-        return TouchTapAction(
-            x=PixelLength(value=x),
-            y=PixelLength(value=y),
-        )
 
-    elif action_name == "Double Tap":
-        element = action.get("element", [500, 500])
-        x, y = convert_relative_to_absolute(element)
-        return TouchTapAction(
-            x=PixelLength(value=x),
-            y=PixelLength(value=y),
-        )
+def _handle_launch(
+    action: dict[str, Any], screen_width: int, screen_height: int
+) -> Any:
+    """Convert app launch action."""
+    app_name = action.get("app", "")
+    return OsStartAppByNameAction(name=app_name)
 
-    elif action_name == "Long Press":
-        element = action.get("element", [500, 500])
-        x, y = convert_relative_to_absolute(element)
-        return TouchLongPressAction(
-            x=PixelLength(value=x),
-            y=PixelLength(value=y),
-            duration=3000,
-        )
 
-    elif action_name == "Swipe":
-        start = action.get("start", [500, 500])
-        end = action.get("end", [500, 500])
-        start_x, start_y = convert_relative_to_absolute(start)
-        end_x, end_y = convert_relative_to_absolute(end)
+def _handle_wait(action: dict[str, Any], screen_width: int, screen_height: int) -> Any:
+    """Convert wait action."""
+    duration = str(action.get("duration", "1 seconds"))
+    return WaitAction(duration=_parse_duration_ms(duration))
 
-        dx = end_x - start_x
-        dy = end_y - start_y
 
-        if abs(dx) > abs(dy):
-            direction = "right" if dx > 0 else "left"
-            distance = abs(dx)
-        else:
-            direction = "down" if dy > 0 else "up"
-            distance = abs(dy)
-
-        return TouchSwipeAction(
-            x=PixelLength(value=start_x),
-            y=PixelLength(value=start_y),
-            direction=direction,
-            distance=PixelLength(value=distance),
-        )
+@lru_cache(maxsize=64)
+def _parse_duration_ms(duration: str) -> int:
+    """Parse a model duration such as "2 seconds" into milliseconds (default 1 s)."""
+    match = _DURATION_RE.search(duration)
+    return int(float(match.group(0)) * 1000) if match else 1000
 
-    elif action_name in ("Type", "Type_Name"):
-        text = action.get("text", "")
-        return KeyboardTypeAction(content=text)
 
-    elif action_name == "Back":
-        return AndroidBackAction()
+# Action name -> converter, built once at import
+_HANDLERS: dict[str, Callable[[dict[str, Any], int, int], Any]] = {
+    "Tap": _handle_tap,
+    "Double Tap": _handle_tap,
+    "Long Press": _handle_long_press,
+    "Swipe": _handle_swipe,
+    "Type": _handle_type,
+    "Type_Name": _handle_type,
+    "Back": lambda action, screen_width, screen_height: AndroidBackAction(),
+    "Home": lambda action, screen_width, screen_height: AndroidHomeAction(),
+    "Launch": _handle_launch,
+    "Wait": _handle_wait,
+}
 
-    elif action_name == "Home":
-        return AndroidHomeAction()
 
-    elif action_name == "Launch":
-        app_name = action.get("app", "")
-        return OsStartAppByNameAction(name=app_name)
+def convert_action_to_lybic(action: dict[str, Any], screen_width: int, screen_height: int) -> Any:
+    """
+    Convert phone_agent action dict to lybic action object.
 
-    elif action_name == "Wait":
-        duration_str = action.get("duration", "1 seconds")
-        try:
-            duration = float(duration_str.replace("seconds", "").strip())
-        except ValueError:
-            duration = 1.0
-        return WaitAction(duration=int(duration * 1000))
+    Args:
+        action: Action dictionary from the AI model.
+        screen_width: Screen width in pixels.
+        screen_height: Screen height in pixels.
 
-    else:
+    Returns:
+        Lybic action object.
+    """
+    if action.get("_metadata") == "finish":
+        return FinishedAction(message=action.get("message"))
+
+    handler = _HANDLERS.get(action.get("action"))
+    if handler is None:
         # Default: return a wait action for unknown actions
         return WaitAction(duration=1000)
+    return handler(action, screen_width, screen_height)